@@ -1,15 +1,22 @@
 import base64
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+import hashlib
 import json
 import pathlib
+import random
 from functools import cache
 import os
 import shutil
+import tarfile
+import tempfile
+import threading
 import time
-from typing import Any, Mapping, Sequence, List, Optional
+import zipfile
+from typing import Any, Callable, Mapping, Sequence, List, Optional
 from const import APPLE_TEAM_ID, CHAT_BINARY_NAME, CHAT_PACKAGE_NAME
-from util import debug, info, isDarwin, isLinux, run_cmd, run_cmd_output, warn
-from rust import cargo_cmd_name, rust_env, rust_targets
+from util import debug, info, isDarwin, isLinux, run_cmd, run_cmd_output, stage_file, warn
+from rust import cargo_cmd_name, get_target_triple, rust_env, rust_targets
 from importlib import import_module
 
 Args = Sequence[str | os.PathLike]
@@ -19,6 +26,8 @@ Cwd = str | os.PathLike
 BUILD_DIR_RELATIVE = pathlib.Path(os.environ.get("BUILD_DIR") or "build")
 BUILD_DIR = BUILD_DIR_RELATIVE.absolute()
 
+CLIPPY_TARGET_DIR = pathlib.Path("target").absolute() / "clippy"
+
 CD_SIGNER_REGION = "us-west-2"
 SIGNING_API_BASE_URL = "https://api.signer.builder-tools.aws.dev"
 
@@ -41,29 +50,98 @@ class MacOSBuildOutput:
     """The path to the chat binary zipped"""
 
 
-def run_cargo_tests():
+def run_cargo_tests(cargo_env: Mapping[str, str] | None = None):
     args = [cargo_cmd_name()]
     args.extend(["test", "--locked", "--package", CHAT_PACKAGE_NAME])
     run_cmd(
         args,
         env={
             **os.environ,
-            **rust_env(release=False),
+            **(cargo_env or rust_env(release=False)),
         },
     )
 
 
-def run_clippy():
+def run_clippy(cargo_env: Mapping[str, str] | None = None):
     args = [cargo_cmd_name(), "clippy", "--locked", "--package", CHAT_PACKAGE_NAME]
     run_cmd(
         args,
         env={
             **os.environ,
-            **rust_env(release=False),
+            **(cargo_env or rust_env(release=False)),
+            # Separate from the default target dir so clippy doesn't block on cargo's
+            # build directory lock while the tests are running.
+            "CARGO_TARGET_DIR": CLIPPY_TARGET_DIR,
         },
     )
 
 
+# Tracked paths that only affect packaging or CI, not whether cargo tests and clippy pass.
+SOURCE_DIGEST_EXCLUDED_DIRS = (".github/", ".husky/", "build-config/", "scripts/", "terminal-bench-test/")
+
+# `rust_env` entries that change on every build and don't affect test or lint results.
+SOURCE_DIGEST_VOLATILE_ENV = ("AMAZON_Q_BUILD_HASH", "AMAZON_Q_BUILD_DATETIME")
+
+
+def source_digest(cargo_env: Mapping[str, str]) -> str | None:
+    """
+    Returns a digest of the build configuration (rust toolchain, cargo command, target triple, and the
+    non-volatile entries of `cargo_env`), `Cargo.lock`, and every git-tracked file in the workspace
+    outside of `SOURCE_DIGEST_EXCLUDED_DIRS`. Used to skip tests and lints that already passed for the
+    same inputs.
+
+    Returns `None` if the digest can't be computed, e.g. when building from a source archive without git.
+    """
+    try:
+        rustc_version = run_cmd_output(["rustc", "-V"])
+        tracked = run_cmd_output(["git", "ls-files", "-z", "--cached"])
+    except Exception as e:
+        warn("Failed to compute source digest, tests and lints will not be cached:", e)
+        return None
+
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(rustc_version.encode())
+    hasher.update(f"{cargo_cmd_name()}\0{get_target_triple()}\0".encode())
+    for key, value in sorted(cargo_env.items()):
+        if key not in SOURCE_DIGEST_VOLATILE_ENV:
+            hasher.update(f"{key}={value}\0".encode())
+
+    # Only tracked files are hashed: `build/` and `target/` are not gitignored here, so including
+    # untracked files would pull in build output (and the sentinels themselves). Cargo.lock is
+    # untracked in this repo but still decides which dependencies get built.
+    paths = {p for p in tracked.split("\0") if p and not p.startswith(SOURCE_DIGEST_EXCLUDED_DIRS)}
+    paths.add("Cargo.lock")
+    for path in sorted(paths):
+        hasher.update(f"{path}\0".encode())
+        file = pathlib.Path(path)
+        if not file.is_file():
+            # Deleted but still in the index, which must invalidate the digest.
+            hasher.update(b"<missing>\0")
+            continue
+        with open(file, "rb") as f:
+            while chunk := f.read(16 * 1024 * 1024):
+                hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def run_if_changed(name: str, digest: str | None, fn: Callable[[], None]):
+    """
+    Runs `fn` unless a sentinel for `digest` shows it previously succeeded, recording a sentinel on success.
+    Always runs `fn`, without recording a sentinel, when `digest` is `None`.
+    """
+    if digest is None:
+        info(f"Running cargo {name}")
+        fn()
+        return
+    sentinel = BUILD_DIR / f".{name}_ok_{digest}"
+    if sentinel.exists():
+        info(f"Skipping cargo {name} (cached)")
+        return
+    info(f"Running cargo {name}")
+    fn()
+    sentinel.touch()
+
+
 def build_chat_bin(
     release: bool,
     output_name: str | None = None,
@@ -109,26 +187,106 @@ def build_chat_bin(
         target_path = pathlib.Path("target") / target / target_subdir / package
         out_path = BUILD_DIR / "bin" / f"{(output_name or package)}-{target}"
         out_path.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(target_path, out_path)
+        stage_file(target_path, out_path)
         return out_path
 
 
 @cache
-def get_creds():
+def _session():
     boto3 = import_module("boto3")
-    session = boto3.Session()
-    credentials = session.get_credentials()
+    return boto3.Session()
+
+
+@cache
+def get_creds():
+    credentials = _session().get_credentials()
     creds = credentials.get_frozen_credentials()
     return creds
 
 
-def cd_signer_request(method: str, path: str, data: str | None = None):
+@cache
+def _s3():
     """
-    Sends a request to the CD Signer API.
+    Returns a shared S3 client, avoiding an `aws` CLI process per S3 operation.
+    """
+    Config = import_module("botocore.config").Config
+    return _session().client("s3", config=Config(max_pool_connections=32))
+
+
+def s3_purge(s3, bucket: str, *prefixes: str):
+    """
+    Deletes every object under each of `prefixes` in `bucket`, equivalent to `aws s3 rm --recursive`.
+    Each listed page (up to 1000 keys) is removed with a single `DeleteObjects` request.
+    """
+    paginator = s3.get_paginator("list_objects_v2")
+    for prefix in prefixes:
+        for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+            objects = [{"Key": obj["Key"]} for obj in page.get("Contents", [])]
+            if not objects:
+                continue
+            errors = s3.delete_objects(Bucket=bucket, Delete={"Objects": objects, "Quiet": True}).get("Errors")
+            if errors:
+                raise RuntimeError(f"Failed to delete objects under s3://{bucket}/{prefix}: {errors}")
+
+
+CD_SIGNER_RETRY_STATUS_CODES = (429, 502, 503, 504)
+CD_SIGNER_MAX_BACKOFF = 30
+# (connect, read) timeouts in seconds, so a stalled connection is retried instead of hanging forever.
+CD_SIGNER_REQUEST_TIMEOUT = (10, 60)
+CD_SIGNER_MAX_CONCURRENT_REQUESTS = 8
+
+# All CD Signer callers in this process share one quota, so concurrent requests are bounded and a
+# 429 seen by any caller pauses every caller until the advertised wait has elapsed.
+_signer_slots = threading.Semaphore(CD_SIGNER_MAX_CONCURRENT_REQUESTS)
+_signer_cooldown_lock = threading.Lock()
+_signer_cooldown_until = 0.0
+
+
+@cache
+def _signer_deps():
+    """
+    Returns the SigV4 signing classes, a shared `requests.Session`, and the transient request
+    errors worth retrying, so repeated CD Signer requests reuse the imports and keep-alive connections.
     """
     SigV4Auth = import_module("botocore.auth").SigV4Auth
     AWSRequest = import_module("botocore.awsrequest").AWSRequest
     requests = import_module("requests")
+    retryable_errors = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+    return SigV4Auth, AWSRequest, requests.Session(), retryable_errors
+
+
+def _backoff_delay(attempt: int, retry_after: str | None = None) -> float:
+    """
+    Returns the number of seconds to wait before retry `attempt`, honoring the server's
+    `Retry-After` header (in seconds) when present, otherwise a jittered exponential backoff
+    capped at `CD_SIGNER_MAX_BACKOFF`.
+    """
+    if retry_after:
+        try:
+            # Not capped: retrying before the advertised time would just be rate limited again.
+            return max(0, int(retry_after))
+        except ValueError:
+            pass
+    return min(CD_SIGNER_MAX_BACKOFF, 2**attempt) * (0.5 + random.random() * 0.5)
+
+
+def _signer_cooldown(delay: float):
+    global _signer_cooldown_until
+    with _signer_cooldown_lock:
+        _signer_cooldown_until = max(_signer_cooldown_until, time.time() + delay)
+
+
+def _wait_for_signer_cooldown():
+    remaining = _signer_cooldown_until - time.time()
+    if remaining > 0:
+        time.sleep(remaining)
+
+
+def cd_signer_request(method: str, path: str, data: str | None = None):
+    """
+    Sends a request to the CD Signer API.
+    """
+    SigV4Auth, AWSRequest, session, retryable_errors = _signer_deps()
 
     url = f"{SIGNING_API_BASE_URL}{path}"
     headers = {"Content-Type": "application/json"}
@@ -136,12 +294,31 @@ def cd_signer_request(method: str, path: str, data: str | None = None):
     SigV4Auth(get_creds(), "signer-builder-tools", CD_SIGNER_REGION).add_auth(request)
 
     for i in range(1, 8):
+        _wait_for_signer_cooldown()
         debug(f"Sending request {method} to {url} with data: {data}")
-        response = requests.request(method=method, url=url, headers=dict(request.headers), data=data)
+        try:
+            with _signer_slots:
+                response = session.request(
+                    method=method,
+                    url=url,
+                    headers=dict(request.headers),
+                    data=data,
+                    timeout=CD_SIGNER_REQUEST_TIMEOUT,
+                )
+        except retryable_errors as e:
+            delay = _backoff_delay(i)
+            warn(f"CDSigner Request ({url}) failed: {e}, backing off for {delay:.1f} seconds")
+            time.sleep(delay)
+            continue
         info(f"CDSigner Request ({url}): {response.status_code}")
-        if response.status_code == 429:
-            warn(f"Too many requests, backing off for {2**i} seconds")
-            time.sleep(2**i)
+        if response.status_code in CD_SIGNER_RETRY_STATUS_CODES:
+            delay = _backoff_delay(i, response.headers.get("Retry-After"))
+            warn(f"Received {response.status_code}, backing off for {delay:.1f} seconds")
+            if response.status_code == 429:
+                # Rate limits apply to the whole quota, so make every caller wait, not just this one.
+                _signer_cooldown(delay)
+            else:
+                time.sleep(delay)
             continue
         return response
 
@@ -206,18 +383,19 @@ def cd_build_signed_package(exe_path: pathlib.Path):
     # Trying a different format without manifest.yaml and placing EXECUTABLES_TO_SIGN
     # at the root.
     # The docs contain conflicting information, idk what to even do here
-    working_dir = BUILD_DIR / "package"
-    shutil.rmtree(working_dir, ignore_errors=True)
-    (BUILD_DIR / "package" / "EXECUTABLES_TO_SIGN").mkdir(parents=True)
+    # Staging under BUILD_DIR keeps the move below a rename on the same filesystem, so the binary
+    # is never copied, and the staging dir is removed even if packaging fails.
+    with tempfile.TemporaryDirectory(dir=BUILD_DIR) as tmp_dir:
+        working_dir = pathlib.Path(tmp_dir)
+        (working_dir / "EXECUTABLES_TO_SIGN").mkdir()
 
-    shutil.copy2(exe_path, working_dir / "EXECUTABLES_TO_SIGN" / exe_path.name)
-    exe_path.unlink()
+        shutil.move(exe_path, working_dir / "EXECUTABLES_TO_SIGN" / exe_path.name)
 
-    run_cmd(["gtar", "-czf", "artifact.gz", "EXECUTABLES_TO_SIGN"], cwd=working_dir)
-    run_cmd(
-        ["gtar", "-czf", BUILD_DIR / "package.tar.gz", "artifact.gz"],
-        cwd=working_dir,
-    )
+        # The package is uploaded once and then discarded, so favor compression speed over size.
+        with tarfile.open(working_dir / "artifact.gz", "w:gz", compresslevel=1, format=tarfile.GNU_FORMAT) as tf:
+            tf.add(working_dir / "EXECUTABLES_TO_SIGN", arcname="EXECUTABLES_TO_SIGN")
+        with tarfile.open(BUILD_DIR / "package.tar.gz", "w:gz", compresslevel=1, format=tarfile.GNU_FORMAT) as tf:
+            tf.add(working_dir / "artifact.gz", arcname="artifact.gz")
 
     return BUILD_DIR / "package.tar.gz"
 
@@ -257,9 +435,9 @@ def sign_executable(signing_data: CdSigningData, exe_path: pathlib.Path) -> path
     package_path = cd_build_signed_package(exe_path)
 
     info("Uploading...")
-    run_cmd(["aws", "s3", "rm", "--recursive", f"s3://{signing_data.bucket_name}/signed"])
-    run_cmd(["aws", "s3", "rm", "--recursive", f"s3://{signing_data.bucket_name}/pre-signed"])
-    run_cmd(["aws", "s3", "cp", package_path, f"s3://{signing_data.bucket_name}/pre-signed/package.tar.gz"])
+    s3 = _s3()
+    s3_purge(s3, signing_data.bucket_name, "signed/", "pre-signed/")
+    s3.upload_file(str(package_path), signing_data.bucket_name, "pre-signed/package.tar.gz")
 
     info("Sending request...")
     request_id = cd_signer_create_request(manifest("com.amazon.codewhisperer"))
@@ -290,7 +468,9 @@ def sign_executable(signing_data: CdSigningData, exe_path: pathlib.Path) -> path
 
         if time.time() >= end_time:
             raise RuntimeError("Signed package did not appear, check signer logs")
-        time.sleep(2)
+        # Signing usually takes a minute or two, so back off the polling rather than checking every few seconds.
+        interval = min(15, 1.5 ** min(i, 8)) * (0.8 + random.random() * 0.4)
+        time.sleep(min(interval, max(0, end_time - time.time())))
         i += 1
 
     info("Signed!")
@@ -301,7 +481,7 @@ def sign_executable(signing_data: CdSigningData, exe_path: pathlib.Path) -> path
 
     # Create a new directory for unzipping the signed executable.
     zip_dl_path = BUILD_DIR / pathlib.Path("signed.zip")
-    run_cmd(["aws", "s3", "cp", f"s3://{signing_data.bucket_name}/signed/signed.zip", zip_dl_path])
+    s3.download_file(signing_data.bucket_name, "signed/signed.zip", str(zip_dl_path))
     payload_path = BUILD_DIR / "signed"
     shutil.rmtree(payload_path, ignore_errors=True)
     run_cmd(["unzip", zip_dl_path, "-d", payload_path])
@@ -490,47 +670,68 @@ def parse_region_from_arn(arn: str) -> str:
 
 
 def generate_sha(path: pathlib.Path) -> pathlib.Path:
-    if isDarwin():
-        shasum_output = run_cmd_output(["shasum", "-a", "256", path])
-    elif isLinux():
-        shasum_output = run_cmd_output(["sha256sum", path])
-    else:
-        raise Exception("Unsupported platform")
-
-    sha = shasum_output.split(" ")[0]
+    # Hash in-process with OpenSSL rather than spawning shasum/sha256sum. Callers hash right
+    # after writing the file, so the read is served from the page cache.
+    with open(path, "rb") as f:
+        sha = hashlib.file_digest(f, "sha256").hexdigest()
     path = path.with_name(f"{path.name}.sha256")
     path.write_text(sha)
     info(f"Wrote sha256sum to {path}:", sha)
     return path
 
 
-def build_linux(chat_path: pathlib.Path, signer: GpgSigner | None):
+@cache
+def tar_gzip_args() -> List[str]:
     """
-    Creates qchat.tar.gz and qchat.zip archives under `BUILD_DIR`.
+    Returns the tar arguments used to gzip an archive, preferring the multithreaded `pigz` when available.
     """
-    chat_dst = BUILD_DIR / CHAT_BINARY_NAME
-    chat_dst.unlink(missing_ok=True)
-    shutil.copy2(chat_path, chat_dst)
+    if shutil.which("pigz"):
+        return ["--use-compress-program=pigz -n"]
+    warn("pigz not found, falling back to gzip")
+    return ["-z"]
 
+
+def _make_tar_gz(chat_path: pathlib.Path, signer: GpgSigner | None) -> pathlib.Path:
     tar_gz_path = BUILD_DIR / f"{CHAT_BINARY_NAME}.tar.gz"
     tar_gz_path.unlink(missing_ok=True)
     info(f"Creating tar output to {tar_gz_path}")
-    run_cmd(["tar", "-czf", tar_gz_path, "-C", BUILD_DIR, chat_dst.name], cwd=BUILD_DIR)
+    run_cmd(["tar", *tar_gzip_args(), "-cf", tar_gz_path, "-C", BUILD_DIR, chat_path.name], cwd=BUILD_DIR)
     generate_sha(tar_gz_path)
     if signer:
         signer.sign_file(tar_gz_path)
+    return tar_gz_path
+
 
+def _make_zip(chat_path: pathlib.Path, signer: GpgSigner | None) -> pathlib.Path:
     zip_path = BUILD_DIR / f"{CHAT_BINARY_NAME}.zip"
     zip_path.unlink(missing_ok=True)
     info(f"Creating zip output to {zip_path}")
-    run_cmd(["zip", "-j", zip_path, chat_dst], cwd=BUILD_DIR)
+    # Deflate level 1 is much cheaper than zip's default on the large binary for only a small size penalty.
+    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+        zf.write(chat_path, arcname=chat_path.name)
     generate_sha(zip_path)
     if signer:
         signer.sign_file(zip_path)
+    return zip_path
 
-    # clean up
-    if signer:
-        signer.clean()
+
+def build_linux(chat_path: pathlib.Path, signer: GpgSigner | None):
+    """
+    Creates qchat.tar.gz and qchat.zip archives under `BUILD_DIR`.
+    """
+    chat_dst = BUILD_DIR / CHAT_BINARY_NAME
+    stage_file(chat_path, chat_dst)
+
+    # Each archive is an independent compressor subprocess, so run them concurrently.
+    try:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [executor.submit(make, chat_dst, signer) for make in (_make_tar_gz, _make_zip)]
+            for future in futures:
+                future.result()
+    finally:
+        # clean up
+        if signer:
+            signer.clean()
 
 
 def build(
@@ -576,13 +777,18 @@ def build(
     info(f"Targets: {targets}")
     info(f"Signing app: {signing_data is not None or gpg_signer is not None}")
 
-    if run_test:
-        info("Running cargo tests")
-        run_cargo_tests()
-
-    if run_lints:
-        info("Running cargo clippy")
-        run_clippy()
+    # Tests and lints are independent, so overlap them. The env is resolved here on the main thread so
+    # its cached helpers run once and both cargo invocations see identical values.
+    cargo_env = rust_env(release=False)
+    digest = source_digest(cargo_env) if run_test or run_lints else None
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = []
+        if run_test:
+            futures.append(executor.submit(run_if_changed, "tests", digest, lambda: run_cargo_tests(cargo_env)))
+        if run_lints:
+            futures.append(executor.submit(run_if_changed, "clippy", digest, lambda: run_clippy(cargo_env)))
+        for future in futures:
+            future.result()
 
     info("Building", CHAT_PACKAGE_NAME)
     chat_path = build_chat_bin(
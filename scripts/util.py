@@ -3,6 +3,7 @@ from functools import cache
 import json
 import os
 import shlex
+import shutil
 import stat
 import subprocess
 import pathlib
@@ -124,6 +125,17 @@ def set_executable(path: pathlib.Path):
     os.chmod(path, st.st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
 
 
+def stage_file(src: pathlib.Path, dst: pathlib.Path):
+    """
+    Places `src` at `dst`, hardlinking when possible and falling back to a copy, e.g. across filesystems.
+    """
+    dst.unlink(missing_ok=True)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
 class Variant(Enum):
     FULL = 1
     MINIMAL = 2
@@ -1,3 +1,4 @@
+import functools
 import os
 import shlex
 from pathlib import Path
@@ -20,11 +21,11 @@ class AmazonQCLIAgent(AbstractInstalledAgent):
     """
     Makes necessary env vars available in docker containers
     """
-    @property
+    @functools.cached_property
     def _env(self) -> dict[str, str]:
         # SIGv4 = 1 for AWS credentials
         env = {
-            "AMAZON_Q_SIGV4": 1,
+            "AMAZON_Q_SIGV4": "1",
             "AWS_ACCESS_KEY_ID": os.environ.get("AWS_ACCESS_KEY_ID", ''),
             "AWS_SECRET_ACCESS_KEY": os.environ.get("AWS_SECRET_ACCESS_KEY", ''),
             "AWS_SESSION_TOKEN": os.environ.get("AWS_SESSION_TOKEN", ''),